@@ -7,16 +7,59 @@ to retrieve historical URLs of a given domain.
 """
 
 import argparse
+import asyncio
+import datetime
+import functools
+import itertools
 import json
+import re
 import sys
 import time
 import threading
-from typing import List, Dict, Any, Optional
-from urllib.parse import urlparse
+from typing import List, Dict, Any, BinaryIO, Iterable, Optional, Union
+from urllib.parse import urlencode
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+# Optional dependencies: the tool falls back to the synchronous requests
+# path and the stdlib JSON decoder when these are not installed.
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# urllib3 decodes brotli responses when either of these is installed
+try:
+    import brotlicffi as brotli
+except ImportError:
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+CDX_BASE_URL = "https://web.archive.org/cdx/search/cdx"
+CDX_JSON_HEADER = ['original', 'timestamp', 'statuscode']
+CDX_FIRST_YEAR = 1996
+CDX_MAX_CONCURRENCY = 4
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 1
+RETRY_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+HTTP_HEADERS = {
+    'Accept-Encoding': 'br, gzip, deflate' if brotli is not None else 'gzip, deflate',
+    'User-Agent': 'wayrecon/1.0',
+    'Connection': 'keep-alive',
+}
+WRITE_CHUNK_SIZE = 64 * 1024
+WRITE_BUFFER_SIZE = 1 << 20
+
 
 print ("""
  █     █░ ▄▄▄     ▓██   ██▓ ██▀███  ▓█████  ▄████▄   ▒█████   ███▄    █ 
@@ -44,6 +87,10 @@ class LoadingSpinner:
     
     def start(self):
         """Start the spinner animation."""
+        # Nothing to animate when output is piped or redirected
+        if not sys.stdout.isatty():
+            self.running = False
+            return
         self.running = True
         self.thread = threading.Thread(target=self._spin)
         self.thread.daemon = True
@@ -52,8 +99,10 @@ class LoadingSpinner:
     def stop(self):
         """Stop the spinner animation."""
         self.running = False
-        if self.thread:
-            self.thread.join()
+        if not self.thread:
+            return
+        self.thread.join()
+        self.thread = None
         # Clear the spinner line
         print('\r' + ' ' * (len(self.message) + 10), end='\r')
     
@@ -77,6 +126,8 @@ class ProgressBar:
     def update(self, current):
         """Update the progress bar."""
         self.current = current
+        if not sys.stdout.isatty():
+            return
         percent = (current / self.total) * 100
         filled = int((current / self.total) * self.width)
         bar = '█' * filled + '░' * (self.width - filled)
@@ -84,6 +135,8 @@ class ProgressBar:
     
     def complete(self):
         """Mark the progress bar as complete."""
+        if not sys.stdout.isatty():
+            return
         print(f'\r[{"█" * self.width}] 100.0%')
 
 
@@ -95,22 +148,30 @@ class WaybackCDXQuery:
         self.session = self._create_session()
     
     def _create_session(self) -> requests.Session:
-        """Create a requests session with retry strategy."""
+        """Create a requests session with retry strategy and connection pooling."""
         session = requests.Session()
         
         retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+            total=RETRY_TOTAL,
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+            status_forcelist=list(RETRY_STATUS_CODES),
         )
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=16,
+            pool_maxsize=16,
+        )
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         
+        session.headers.update(HTTP_HEADERS)
+        
         return session
     
-    def normalize_domain(self, domain: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def normalize_domain(domain: str) -> str:
         """
         Normalize domain input by stripping protocols and www.
         
@@ -120,10 +181,10 @@ class WaybackCDXQuery:
         Returns:
             Normalized domain string
         """
-        # Remove protocols
-        if domain.startswith(('http://', 'https://')):
-            parsed = urlparse(domain)
-            domain = parsed.netloc
+        # Remove a leading protocol and anything after the host
+        scheme = re.match(r'[a-z][a-z0-9+.-]*://', domain, re.IGNORECASE)
+        if scheme:
+            domain = re.split(r'[/?#]', domain[scheme.end():], maxsplit=1)[0]
         
         # Remove www prefix
         if domain.startswith('www.'):
@@ -131,18 +192,27 @@ class WaybackCDXQuery:
         
         return domain.lower().strip()
     
-    def build_cdx_url(self, domain: str, text_mode: bool = False) -> str:
+    def build_cdx_url(self, domain: str, text_mode: bool = False,
+                      from_year: Optional[int] = None, to_year: Optional[int] = None,
+                      extensions: Optional[List[str]] = None,
+                      status_codes: Optional[List[int]] = None,
+                      with_urlkey: bool = False) -> str:
         """
         Build the CDX API URL for the given domain.
         
         Args:
             domain: The normalized domain
             text_mode: Whether to use text output format
+            from_year: Optional first capture year to include
+            to_year: Optional last capture year to include
+            extensions: Optional extension filter, applied server-side
+            status_codes: Optional status code filter, applied server-side
+            with_urlkey: Whether to prepend the urlkey field to each record
             
         Returns:
             Complete CDX API URL
         """
-        base_url = "https://web.archive.org/cdx/search/cdx"
+        base_url = CDX_BASE_URL
         
         if text_mode:
             params = {
@@ -159,22 +229,55 @@ class WaybackCDXQuery:
                 'fl': 'original,timestamp,statuscode'
             }
         
-        # Build URL with parameters
-        url = f"{base_url}?"
-        url += "&".join([f"{k}={v}" for k, v in params.items()])
+        if with_urlkey:
+            params['fl'] = 'urlkey,' + params['fl']
+        if from_year is not None:
+            params['from'] = str(from_year)
+        if to_year is not None:
+            params['to'] = str(to_year)
+        
+        # Server-side filters, mirroring the client-side extension regex.
+        # Filtering before the collapse means every query keeps the same
+        # captures, however many values are given.
+        filters = []
+        if status_codes:
+            codes = '|'.join(str(code) for code in status_codes)
+            filters.append(f'statuscode:({codes})')
+        if extensions:
+            exts = '|'.join(re.escape(ext.lower().lstrip('.')) for ext in extensions)
+            filters.append(f'original:(?i).*\\.({exts})([?#].*)?$')
+        if filters:
+            params['filter'] = filters
+        
+        # Build URL with percent-encoded parameters
+        return f"{base_url}?{urlencode(params, doseq=True)}"
+    
+    @staticmethod
+    def _parse_text_lines(body: bytes) -> List[str]:
+        """
+        Split a text-format CDX response into non-empty URL lines.
         
-        if self.verbose:
-            print(f"[VERBOSE] Constructed CDX URL: {url}")
+        Lines are split on newlines only and decoded individually, with
+        undecodable bytes replaced, so one bad byte in an archived URL
+        cannot abort the whole run.
         
-        return url
+        Args:
+            body: Raw response body
+            
+        Returns:
+            List of URLs
+        """
+        return [line.decode('utf-8', 'replace') for line in
+                (raw.strip() for raw in body.split(b'\n')) if line]
     
-    def fetch_cdx_data(self, url: str, show_animation: bool = True) -> List[Any]:
+    def fetch_cdx_data(self, url: str, show_animation: bool = True, text_mode: bool = False) -> List[Any]:
         """
         Fetch data from the CDX API with retries.
         
         Args:
             url: The CDX API URL
             show_animation: Whether to show loading animation
+            text_mode: Whether the URL requests text output format
             
         Returns:
             List of CDX records
@@ -192,10 +295,6 @@ class WaybackCDXQuery:
             spinner.start()
         
         try:
-            # Simulate some processing steps with progress
-            if show_animation and not self.verbose:
-                time.sleep(0.5)  # Brief pause to show spinner
-            
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
             
@@ -212,17 +311,15 @@ class WaybackCDXQuery:
                 spinner = LoadingSpinner("Processing results")
                 spinner.start()
             
-            # Parse response based on content type
-            if 'application/json' in response.headers.get('content-type', ''):
-                data = response.json()
+            # Parse response in the format requested by build_cdx_url
+            if text_mode:
+                data = self._parse_text_lines(response.content)
+            else:
+                data = _json_loads(response.content) if response.content.strip() else []
                 if isinstance(data, list) and len(data) > 0:
                     # Remove header row if present
-                    if data[0] == ['original', 'timestamp', 'statuscode']:
-                        data = data[1:]
-            else:
-                # Text format - split by lines
-                lines = response.text.strip().split('\n')
-                data = [line.strip() for line in lines if line.strip()]
+                    if data[0] == CDX_JSON_HEADER:
+                        del data[0]
             
             # Stop processing spinner
             if spinner:
@@ -237,57 +334,144 @@ class WaybackCDXQuery:
                 print(f"[VERBOSE] Request failed: {e}")
             raise
     
-    def filter_by_extensions(self, data: List[Any], extensions: List[str], text_mode: bool = False, show_animation: bool = True) -> List[Any]:
+    async def fetch_cdx_data_async(self, domain: str, text_mode: bool = False, show_animation: bool = True,
+                                   extensions: Optional[List[str]] = None,
+                                   status_codes: Optional[List[int]] = None) -> List[Any]:
         """
-        Filter URLs by file extensions.
+        Fetch data from the CDX API using parallel per-year queries.
+        
+        The capture history from 1996 to the current year is split into
+        one query per year, and up to CDX_MAX_CONCURRENCY queries are in
+        flight at once over a shared aiohttp session. Each query is retried
+        on its own, and the shards are merged on the CDX urlkey so the
+        result matches a single collapsed query.
         
         Args:
-            data: List of CDX records
-            extensions: List of file extensions to filter by
-            text_mode: Whether data is in text format
+            domain: The normalized domain
+            text_mode: Whether to use text output format
             show_animation: Whether to show loading animation
+            extensions: Optional extension filter passed to build_cdx_url
+            status_codes: Optional status code filter passed to build_cdx_url
             
         Returns:
-            Filtered list of records
+            List of CDX records, one per urlkey, in urlkey order
+            
+        Raises:
+            aiohttp.ClientError: If any of the requests fail
+            asyncio.TimeoutError: If any of the requests time out
         """
-        if not extensions:
-            return data
+        current_year = datetime.date.today().year
+        urls = [
+            self.build_cdx_url(domain, text_mode, from_year=year, to_year=year,
+                               extensions=extensions, status_codes=status_codes,
+                               with_urlkey=True)
+            for year in range(CDX_FIRST_YEAR, current_year + 1)
+        ]
+        
+        if self.verbose:
+            print(f"[VERBOSE] Making {len(urls)} parallel requests for {CDX_FIRST_YEAR}-{current_year} "
+                  f"(concurrency {CDX_MAX_CONCURRENCY})")
+            print(f"[VERBOSE] Constructed CDX URL ({CDX_FIRST_YEAR} shown): {urls[0]}")
         
-        # Start filtering animation
         spinner = None
         if show_animation and not self.verbose:
-            spinner = LoadingSpinner("Filtering by extensions")
+            spinner = LoadingSpinner("Fetching data from Wayback Machine")
             spinner.start()
         
+        semaphore = asyncio.Semaphore(CDX_MAX_CONCURRENCY)
+        timeout = aiohttp.ClientTimeout(total=60)
+        connector = aiohttp.TCPConnector(limit=8, ttl_dns_cache=300)
+        
+        async def get_with_retry(session: "aiohttp.ClientSession", url: str) -> bytes:
+            # Same policy as the sync session's Retry, applied per shard
+            for attempt in range(RETRY_TOTAL + 1):
+                delay = RETRY_BACKOFF_FACTOR * (2 ** attempt)
+                try:
+                    async with semaphore:
+                        async with session.get(url, timeout=timeout) as resp:
+                            if resp.status in RETRY_STATUS_CODES and attempt < RETRY_TOTAL:
+                                retry_after = resp.headers.get('Retry-After', '')
+                                if retry_after.isdigit():
+                                    delay = int(retry_after)
+                                if self.verbose:
+                                    print(f"[VERBOSE] HTTP {resp.status} for {url}, retrying in {delay}s")
+                            else:
+                                resp.raise_for_status()
+                                return await resp.read()
+                except aiohttp.ClientResponseError:
+                    raise
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    if attempt == RETRY_TOTAL:
+                        raise
+                    if self.verbose:
+                        print(f"[VERBOSE] Request failed ({e}), retrying in {delay}s")
+                await asyncio.sleep(delay)
+        
+        async def fetch_shard(session: "aiohttp.ClientSession", url: str) -> List[Any]:
+            # Returns (urlkey, record) pairs
+            body = await get_with_retry(session, url)
+            if text_mode:
+                pairs = (line.partition(' ') for line in self._parse_text_lines(body))
+                return [(urlkey, original) for urlkey, _, original in pairs if original]
+            # An empty year is returned as an empty body
+            if not body.strip():
+                return []
+            rows = _json_loads(body)
+            if rows and rows[0] == ['urlkey'] + CDX_JSON_HEADER:
+                rows = itertools.islice(rows, 1, None)
+            return [(row[0], row[1:]) for row in rows]
+        
         try:
-            extensions = [ext.lower().lstrip('.') for ext in extensions]
-            filtered_data = []
-            
-            # Simulate processing time for animation
-            if show_animation and not self.verbose:
-                time.sleep(0.3)
-            
-            for record in data:
-                if text_mode:
-                    url = record
-                else:
-                    url = record[0] if isinstance(record, list) else record
-                
-                # Check if URL ends with any of the specified extensions
-                url_lower = url.lower()
-                if any(url_lower.endswith(f'.{ext}') for ext in extensions):
-                    filtered_data.append(record)
-            
-            # Stop spinner
+            async with aiohttp.ClientSession(connector=connector, headers=HTTP_HEADERS) as session:
+                shards = await asyncio.gather(*[fetch_shard(session, u) for u in urls])
+        finally:
             if spinner:
                 spinner.stop()
+        
+        # collapse=urlkey only applies within a single query, so the same
+        # URL can show up in several years; keep its earliest capture and
+        # return records in urlkey order, like a single collapsed query.
+        merged = {}
+        for shard in shards:
+            for urlkey, record in shard:
+                if urlkey not in merged:
+                    merged[urlkey] = record
+        data = [merged[urlkey] for urlkey in sorted(merged)]
+        
+        if self.verbose:
+            print(f"[VERBOSE] Received {len(data)} unique records from {len(urls)} queries")
+        
+        return data
+    
+    @staticmethod
+    def _build_extension_pattern(extensions: List[str]) -> "re.Pattern":
+        """
+        Compile a single regex matching any of the given file extensions.
+        
+        Args:
+            extensions: List of file extensions, with or without a leading dot
             
-            return filtered_data
+        Returns:
+            Case-insensitive compiled pattern
+        """
+        alternatives = '|'.join(re.escape(ext.lower().lstrip('.')) for ext in extensions)
+        return re.compile(r'\.(?:' + alternatives + r')(?:$|[?#])', re.IGNORECASE)
+    
+    def filter_by_extensions(self, data: List[Any], extensions: List[str], text_mode: bool = False, show_animation: bool = True) -> List[Any]:
+        """
+        Filter URLs by file extensions.
+        
+        Args:
+            data: List of CDX records
+            extensions: List of file extensions to filter by
+            text_mode: Whether data is in text format
+            show_animation: Whether to show loading animation
             
-        except Exception as e:
-            if spinner:
-                spinner.stop()
-            raise
+        Returns:
+            Filtered list of records
+        """
+        return self.filter(data, extensions, None, text_mode, show_animation,
+                           spinner_message="Filtering by extensions")
     
     def filter_by_status_codes(self, data: List[Any], status_codes: List[int], show_animation: bool = True) -> List[Any]:
         """
@@ -301,43 +485,92 @@ class WaybackCDXQuery:
         Returns:
             Filtered list of records
         """
-        if not status_codes:
+        # Text format - we can't filter by status code in text mode
+        # since status code is not included in text output
+        text_mode = bool(data) and isinstance(data[0], str)
+        return self.filter(data, None, status_codes, text_mode, show_animation,
+                           spinner_message="Filtering by status codes")
+    
+    def filter(self, data: List[Any], extensions: Optional[List[str]], status_codes: Optional[List[int]],
+               text_mode: bool = False, show_animation: bool = True,
+               spinner_message: str = "Filtering results") -> List[Any]:
+        """
+        Filter URLs by file extensions and HTTP status codes in one pass.
+        
+        This is the single filtering implementation; filter_by_extensions
+        and filter_by_status_codes delegate to it.
+        
+        Args:
+            data: List of CDX records
+            extensions: List of file extensions to filter by, or None
+            status_codes: List of HTTP status codes to filter by, or None
+                (ignored in text mode, which has no status codes)
+            text_mode: Whether data is in text format
+            show_animation: Whether to show loading animation
+            spinner_message: Message shown next to the loading spinner
+            
+        Returns:
+            Filtered list of records
+        """
+        pattern = self._build_extension_pattern(extensions) if extensions else None
+        # CDX returns status codes as strings, and "-" for revisit records,
+        # so compare as strings: non-numeric statuses simply never match
+        codes = frozenset(str(code) for code in status_codes) if status_codes and not text_mode else None
+        
+        if pattern is None and codes is None:
             return data
         
         # Start filtering animation
         spinner = None
         if show_animation and not self.verbose:
-            spinner = LoadingSpinner("Filtering by status codes")
+            spinner = LoadingSpinner(spinner_message)
             spinner.start()
         
         try:
-            filtered_data = []
-            
-            # Simulate processing time for animation
-            if show_animation and not self.verbose:
-                time.sleep(0.3)
-            
-            for record in data:
-                if isinstance(record, list) and len(record) >= 3:
-                    # JSON format: [original, timestamp, statuscode]
-                    status_code = int(record[2])
-                    if status_code in status_codes:
-                        filtered_data.append(record)
-                elif isinstance(record, str):
-                    # Text format - we can't filter by status code in text mode
-                    # since status code is not included in text output
-                    filtered_data.append(record)
-            
-            # Stop spinner
+            # Match the extension at the end of the path, before any query or fragment
+            if text_mode:
+                return list(filter(pattern.search, data))
+            if codes is None:
+                return [record for record in data if pattern.search(record[0])]
+            if pattern is None:
+                return [record for record in data if record[2] in codes]
+            return [record for record in data
+                    if record[2] in codes and pattern.search(record[0])]
+        finally:
             if spinner:
                 spinner.stop()
+    
+    def _iter_json_table(self, data: List[List[str]]) -> Iterable[str]:
+        """
+        Yield the lines of the JSON table one at a time.
+        
+        Args:
+            data: Non-empty list of CDX records
             
-            return filtered_data
-            
-        except Exception as e:
-            if spinner:
-                spinner.stop()
-            raise
+        Yields:
+            Header, separator and data row lines, without newlines
+        """
+        # Calculate column widths
+        headers = CDX_JSON_HEADER
+        widths = [len(h) for h in headers]
+        
+        for record in data:
+            for i, field in enumerate(record):
+                if i < len(widths):
+                    widths[i] = max(widths[i], len(str(field)))
+        
+        # Records always have three columns, so each row is a single % format
+        row_format = "%-*s | %-*s | %-*s"
+        w0, w1, w2 = widths
+        
+        # Header
+        header_line = row_format % (w0, headers[0], w1, headers[1], w2, headers[2])
+        yield header_line
+        yield "-" * len(header_line)
+        
+        # Data rows
+        for original, timestamp, statuscode in data:
+            yield row_format % (w0, original, w1, timestamp, w2, statuscode)
     
     def format_json_table(self, data: List[List[str]]) -> str:
         """
@@ -352,29 +585,85 @@ class WaybackCDXQuery:
         if not data:
             return "No results."
         
-        # Calculate column widths
-        headers = ['original', 'timestamp', 'statuscode']
-        widths = [len(h) for h in headers]
+        return "\n".join(self._iter_json_table(data))
+    
+    def _iter_json_table_chunks(self, data: List[List[str]]) -> Iterable[bytes]:
+        """
+        Yield the JSON table as UTF-8 encoded chunks.
         
-        for record in data:
-            for i, field in enumerate(record):
-                if i < len(widths):
-                    widths[i] = max(widths[i], len(str(field)))
+        Rows are encoded and grouped into chunks of about WRITE_CHUNK_SIZE
+        bytes, so the full table is never held in memory as one string.
         
-        # Create table
-        lines = []
+        Args:
+            data: List of CDX records
+            
+        Yields:
+            Encoded chunks of complete lines
+        """
+        if not data:
+            yield b"No results.\n"
+            return
+        
+        chunk = []
+        size = 0
+        for line in self._iter_json_table(data):
+            encoded = line.encode('utf-8') + b"\n"
+            chunk.append(encoded)
+            size += len(encoded)
+            if size >= WRITE_CHUNK_SIZE:
+                yield b"".join(chunk)
+                chunk = []
+                size = 0
+        if chunk:
+            yield b"".join(chunk)
+    
+    def write_json_table(self, data: List[List[str]], stream: BinaryIO) -> None:
+        """
+        Write CDX data as a JSON table to a binary stream, chunk by chunk.
         
-        # Header
-        header_line = " | ".join(h.ljust(w) for h, w in zip(headers, widths))
-        lines.append(header_line)
-        lines.append("-" * len(header_line))
+        Args:
+            data: List of CDX records
+            stream: Binary stream to write to
+        """
+        for chunk in self._iter_json_table_chunks(data):
+            stream.write(chunk)
+    
+    def print_json_table(self, data: List[List[str]]) -> None:
+        """
+        Print CDX data as a JSON table to stdout, chunk by chunk.
         
-        # Data rows
-        for record in data:
-            row_line = " | ".join(str(field).ljust(w) for field, w in zip(record, widths))
-            lines.append(row_line)
+        Writes to sys.stdout.buffer when available, and falls back to
+        sys.stdout.write for replaced text streams such as io.StringIO.
+        
+        Args:
+            data: List of CDX records
+        """
+        buffer = getattr(sys.stdout, 'buffer', None)
+        if buffer is None:
+            for chunk in self._iter_json_table_chunks(data):
+                sys.stdout.write(chunk.decode('utf-8'))
+            return
+        
+        sys.stdout.flush()
+        self.write_json_table(data, buffer)
+        buffer.flush()
+    
+    def save_table_streaming(self, data: List[List[str]], filename: str) -> None:
+        """
+        Save CDX data as a JSON table to a file without building it in memory.
         
-        return "\n".join(lines)
+        Args:
+            data: List of CDX records
+            filename: Output filename
+        """
+        try:
+            with open(filename, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                self.write_json_table(data, f)
+            if self.verbose:
+                print(f"[VERBOSE] Saved output to: {filename}")
+        except IOError as e:
+            print(f"Error saving to file {filename}: {e}")
+            sys.exit(1)
     
     def format_text_list(self, data: List[str]) -> str:
         """
@@ -391,17 +680,23 @@ class WaybackCDXQuery:
         
         return "\n".join(data)
     
-    def save_to_file(self, content: str, filename: str) -> None:
+    def save_to_file(self, content: Union[str, Iterable[str]], filename: str) -> None:
         """
         Save content to a file.
         
         Args:
-            content: Content to save
+            content: Content to save, either a single string or an
+                iterable of lines which are written one per line
             filename: Output filename
         """
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(content)
+            with open(filename, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                if isinstance(content, str):
+                    f.write(content.encode('utf-8'))
+                else:
+                    for line in content:
+                        f.write(line.encode('utf-8'))
+                        f.write(b'\n')
             if self.verbose:
                 print(f"[VERBOSE] Saved output to: {filename}")
         except IOError as e:
@@ -496,10 +791,6 @@ Examples:
     if not args.verbose:
         print("🚀 Wayback Machine CDX Query Tool")
         print("=" * 40)
-        spinner = LoadingSpinner("Initializing")
-        spinner.start()
-        time.sleep(0.5)
-        spinner.stop()
         print("✓ Ready to query Wayback Machine")
         print()
     
@@ -512,70 +803,91 @@ Examples:
             print(f"🔍 Querying domain: {normalized_domain}")
             print()
         
-        # Build CDX URL
-        cdx_url = query_tool.build_cdx_url(normalized_domain, args.text)
+        # Status codes are not included in text output
+        status_codes = args.status
+        if args.status and args.text:
+            print("⚠️  Warning: Status code filtering is not available in text mode (status codes not included in text output)")
+            status_codes = None
+        
+        # Extension and status code filters are applied by the CDX server
+        criteria = []
+        if args.ext:
+            criteria.append(f"extensions: {', '.join(args.ext)}")
+        if status_codes:
+            criteria.append(f"status codes: {', '.join(map(str, status_codes))}")
+        if criteria and args.verbose:
+            print(f"[VERBOSE] Filtering by {'; '.join(criteria)}")
         
         # Fetch data
         if args.verbose:
             print("[VERBOSE] Fetching data from Wayback Machine...")
         
-        data = query_tool.fetch_cdx_data(cdx_url, show_animation=not args.verbose)
-        
-        if args.verbose:
-            print(f"[VERBOSE] Retrieved {len(data)} records")
-        else:
-            print(f"✓ Retrieved {len(data)} records")
+        data = None
+        if aiohttp is not None:
+            try:
+                data = asyncio.run(query_tool.fetch_cdx_data_async(
+                    normalized_domain, args.text, show_animation=not args.verbose,
+                    extensions=args.ext, status_codes=status_codes))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if args.verbose:
+                    print(f"[VERBOSE] Parallel fetch failed ({e}), falling back to single request")
         
-        # Filter by extensions if specified
-        if args.ext:
-            if args.verbose:
-                print(f"[VERBOSE] Filtering by extensions: {args.ext}")
-            data = query_tool.filter_by_extensions(data, args.ext, args.text, show_animation=not args.verbose)
+        if data is None:
+            # Synchronous fallback: a single request with retries
+            cdx_url = query_tool.build_cdx_url(normalized_domain, args.text,
+                                               extensions=args.ext, status_codes=status_codes)
             if args.verbose:
-                print(f"[VERBOSE] After extension filtering: {len(data)} records")
-            else:
-                print(f"✓ Filtered to {len(data)} records matching extensions: {', '.join(args.ext)}")
+                print(f"[VERBOSE] Constructed CDX URL: {cdx_url}")
+            data = query_tool.fetch_cdx_data(cdx_url, show_animation=not args.verbose, text_mode=args.text)
         
-        # Filter by status codes if specified
-        if args.status:
-            if args.text:
-                print("⚠️  Warning: Status code filtering is not available in text mode (status codes not included in text output)")
-            else:
-                if args.verbose:
-                    print(f"[VERBOSE] Filtering by status codes: {args.status}")
-                data = query_tool.filter_by_status_codes(data, args.status, show_animation=not args.verbose)
-                if args.verbose:
-                    print(f"[VERBOSE] After status code filtering: {len(data)} records")
-                else:
-                    print(f"✓ Filtered to {len(data)} records matching status codes: {', '.join(map(str, args.status))}")
-        
-        # Format output
-        if not args.verbose:
-            spinner = LoadingSpinner("Formatting results")
-            spinner.start()
-            time.sleep(0.2)  # Brief pause for animation
-            spinner.stop()
+        matching = f" matching {'; '.join(criteria)}" if criteria else ""
+        if args.verbose:
+            print(f"[VERBOSE] Retrieved {len(data)} records{matching}")
+        else:
+            print(f"✓ Retrieved {len(data)} records{matching}")
         
+        # Format output (JSON tables are rendered row by row while writing)
+        output = None
         if args.text:
-            output = query_tool.format_text_list(data)
-        else:
-            output = query_tool.format_json_table(data)
+            spinner = None
+            if not args.verbose:
+                spinner = LoadingSpinner("Formatting results")
+                spinner.start()
+            
+            try:
+                if args.output and data:
+                    # Plain URLs are written line by line without joining them first
+                    output = data
+                else:
+                    output = query_tool.format_text_list(data)
+            finally:
+                if spinner:
+                    spinner.stop()
         
         # Display or save output
         if args.output:
+            spinner = None
             if not args.verbose:
                 spinner = LoadingSpinner("Saving to file")
                 spinner.start()
-                time.sleep(0.2)
-                spinner.stop()
-            query_tool.save_to_file(output, args.output)
+            try:
+                if args.text:
+                    query_tool.save_to_file(output, args.output)
+                else:
+                    query_tool.save_table_streaming(data, args.output)
+            finally:
+                if spinner:
+                    spinner.stop()
             print(f"✓ Results saved to {args.output}")
         else:
             if not args.verbose:
                 print("\n" + "="*60)
                 print("RESULTS")
                 print("="*60)
-            print(output)
+            if args.text:
+                print(output)
+            else:
+                query_tool.print_json_table(data)
             if not args.verbose:
                 print("\n" + "="*60)
                 print(f"Query completed successfully! Found {len(data)} results.")